@@ -1,19 +1,21 @@
 import argparse
 import asyncio
 import logging
+import os
 from . import server
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger('mcp_applescript')
 
 def main():
     logger.debug("Starting applescript-mcp main()")
     parser = argparse.ArgumentParser(description='Applescript MCP Server')
+    parser.add_argument('--log-level', default=os.environ.get('LOG_LEVEL', 'INFO'))
+    parser.add_argument('--access-token', default=None, help='Passed through to server.main (currently unused)')
     args = parser.parse_args()
 
     # Run the async main function
     logger.debug("About to run server.main()")
-    asyncio.run(server.main())
+    asyncio.run(server.main(args.access_token, args.log_level))
     logger.debug("Server main() completed")
 
 if __name__ == "__main__":
@@ -1,45 +1,32 @@
-import argparse
+import asyncio
 import logging
-import json
-from typing import Any, Dict, List, Optional
-import os
-import tempfile
-import subprocess
+from typing import Any
 from mcp.server.models import InitializationOptions
 import mcp.types as types
 from mcp.server import NotificationOptions, Server
 import mcp.server.stdio
 from pydantic import AnyUrl
 from . import tools
+from .utils.applescript import prepare_dispatcher, start_runner_pool, stop_runner_pool
 
 logger = logging.getLogger('applescript_mcp')
 
 
-def parse_arguments() -> argparse.Namespace:
-    """Use argparse to allow values to be set as CLI switches
-    or environment variables
-
-    """
-    parser = argparse.ArgumentParser()
-    parser.add_argument('--log-level', default=os.environ.get('LOG_LEVEL', 'INFO'))
-    return parser.parse_args()
-
-
-def configure_logging():
+def configure_logging(log_level: str = 'INFO'):
     """Configure logging based on the log level argument"""
-    args = parse_arguments()
-    log_level = getattr(logging, args.log_level.upper(), logging.INFO)
+    level = getattr(logging, log_level.upper(), logging.INFO)
     logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        level=level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        force=True
     )
-    logger.setLevel(log_level)
-    logger.info(f"Logging configured with level: {args.log_level.upper()}")
+    logger.setLevel(level)
+    logger.info(f"Logging configured with level: {log_level.upper()}")
 
 
-async def main(access_token=None):
+async def main(access_token=None, log_level='INFO'):
     """Run the AppleScript MCP server."""
-    configure_logging()
+    configure_logging(log_level)
     logger.info("Server starting")
     server = Server("applescript-mcp")
 
@@ -53,7 +40,7 @@ async def main(access_token=None):
 
     @server.list_tools()
     async def handle_list_tools() -> list[types.Tool]:
-        """List available tools"""
+        """List available tools (built once at import)"""
         return tools.get_tools()
 
     @server.call_tool()
@@ -66,21 +53,27 @@ async def main(access_token=None):
         except Exception as e:
             return [types.TextContent(type="text", text=f"Error: {str(e)}")]
 
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        logger.info("Server running with stdio transport")
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="applescript-mcp",
-                server_version="0.1.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
-                ),
-            ),
-        )
+    init_options = InitializationOptions(
+        server_name="applescript-mcp",
+        server_version="0.1.0",
+        capabilities=server.get_capabilities(
+            notification_options=NotificationOptions(),
+            experimental_capabilities={},
+        ),
+    )
+
+    # Pre-spawn osascript runners so the first tool calls skip process startup
+    await start_runner_pool()
+    # Compile the tool dispatcher in the background so the initialize
+    # handshake does not wait on osacompile; early tool calls share the compile
+    prepare_task = asyncio.create_task(prepare_dispatcher())
+    try:
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            logger.info("Server running with stdio transport")
+            await server.run(read_stream, write_stream, init_options)
+    finally:
+        prepare_task.cancel()
+        await stop_runner_pool()
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(main())
@@ -1,16 +1,70 @@
 """macOS system-level tools for window management, system information, and AppleScript execution."""
 
+import asyncio
+import logging
+import os
+import platform
+import re
+import socket
+import time
 import mcp.types as types
-from typing import List, Dict, Any
-from ..utils.applescript import execute_applescript
+from typing import List, Dict, Any, Optional
+from ..utils.applescript import execute_applescript, execute_dispatcher
 
+logger = logging.getLogger(__name__)
 
-def get_tools() -> List[types.Tool]:
-    """Return list of macOS tool definitions."""
-    return [
-        types.Tool(
-            name="applescript_execute",
-                description="""Run AppleScript code to interact with Mac applications and system features. This tool can access and manipulate data in Notes, Calendar, Contacts, Messages, Mail, Finder, Safari, and other Apple applications. Common use cases include but not limited to:
+# PyObjC is optional; without it the tools fall back to AppleScript
+try:
+    from Quartz import (
+        CGDisplayPixelsHigh,
+        CGDisplayPixelsWide,
+        CGMainDisplayID,
+        CGWindowListCopyWindowInfo,
+        kCGNullWindowID,
+        kCGWindowListExcludeDesktopElements,
+        kCGWindowListOptionAll,
+        kCGWindowOwnerName,
+        kCGWindowOwnerPID,
+    )
+except ImportError:
+    CGMainDisplayID = None
+    CGWindowListCopyWindowInfo = None
+
+try:
+    from AppKit import NSRunningApplication, NSWorkspace, NSApplicationActivateIgnoringOtherApps
+except ImportError:
+    NSWorkspace = None
+
+try:
+    from ApplicationServices import (
+        AXIsProcessTrusted,
+        AXUIElementCopyAttributeValue,
+        AXUIElementCreateApplication,
+        AXUIElementCreateSystemWide,
+        AXUIElementGetPid,
+        AXUIElementSetAttributeValue,
+        AXValueCreate,
+        AXValueGetValue,
+        kAXErrorSuccess,
+        kAXFocusedApplicationAttribute,
+        kAXFocusedWindowAttribute,
+        kAXPositionAttribute,
+        kAXSizeAttribute,
+        kAXValueCGPointType,
+        kAXValueCGSizeType,
+        kAXWindowsAttribute,
+    )
+except ImportError:
+    AXUIElementCreateApplication = None
+
+
+_RES_RE = re.compile(r"Resolution:\s*(\d+)x(\d+)")
+
+# Screen resolution rarely changes, so the last result is reused for a short while
+_SCREEN_CACHE_TTL = 30.0
+_SCREEN_CACHE: Dict[str, Any] = {"value": None, "ts": 0.0}
+
+_APPLESCRIPT_EXECUTE_DESCRIPTION = """Run AppleScript code to interact with Mac applications and system features. This tool can access and manipulate data in Notes, Calendar, Contacts, Messages, Mail, Finder, Safari, and other Apple applications. Common use cases include but not limited to:
 - Retrieve or create notes in Apple Notes
 - Access or add calendar events and appointments
 - List contacts or modify contact details
@@ -20,94 +74,105 @@ def get_tools() -> List[types.Tool]:
 - Access or send emails, messages, or other communications
 - Read, write, or manage file contents
 - Execute shell commands and capture the output
-""",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "code_snippet": {
-                            "type": "string",
-                            "description": "Multi-line AppleScript code to execute"
-                        },
-                        "timeout": {
-                            "type": "integer",
-                            "description": "Command execution timeout in seconds (default: 60)"
-                        }
-                    },
-                    "required": ["code_snippet"],
-                    "additionalProperties": False
-                }
-            ),
-            types.Tool(
-                name="get_screen_resolution",
-                description="Get the current screen resolution and display information",
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
-                    "additionalProperties": False
-                }
-            ),
-            types.Tool(
-                name="foreground_window",
-                description="Bring a window of the specified application to the foreground",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "app_name": {
-                            "type": "string",
-                            "description": "Name of the application to bring to foreground"
-                        }
-                    },
-                    "required": ["app_name"],
-                    "additionalProperties": False
+"""
+
+# Tool definitions are static, so they are built once at import time
+_TOOLS: List[types.Tool] = [
+    types.Tool(
+        name="applescript_execute",
+        description=_APPLESCRIPT_EXECUTE_DESCRIPTION,
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "code_snippet": {
+                    "type": "string",
+                    "description": "Multi-line AppleScript code to execute"
+                },
+                "timeout": {
+                    "type": "integer",
+                    "description": "Command execution timeout in seconds (default: 60)"
                 }
-            ),
-            types.Tool(
-                name="dock_window_horizontal",
-                description="Dock a window horizontally using percentage bounds (e.g., 0,50 for left half, 50,100 for right half)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "app_name": {
-                            "type": "string",
-                            "description": "Application name to dock"
-                        },
-                        "left_percent": {
-                            "type": "number",
-                            "description": "Left edge as percentage of screen width (0-100)"
-                        },
-                        "right_percent": {
-                            "type": "number",
-                            "description": "Right edge as percentage of screen width (0-100)"
-                        }
-                    },
-                    "required": ["app_name", "left_percent", "right_percent"],
-                    "additionalProperties": False
+            },
+            "required": ["code_snippet"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="get_screen_resolution",
+        description="Get the current screen resolution and display information",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="foreground_window",
+        description="Bring a window of the specified application to the foreground",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "app_name": {
+                    "type": "string",
+                    "description": "Name of the application to bring to foreground"
                 }
-            ),
-            types.Tool(
-                name="get_window_info",
-                description="Get information about the frontmost window including position and size",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "app_name": {
-                            "type": "string",
-                            "description": "Optional: specific application name to get info for"
-                        }
-                    },
-                    "additionalProperties": False
+            },
+            "required": ["app_name"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="dock_window_horizontal",
+        description="Dock a window horizontally using percentage bounds (e.g., 0,50 for left half, 50,100 for right half)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "app_name": {
+                    "type": "string",
+                    "description": "Application name to dock"
+                },
+                "left_percent": {
+                    "type": "number",
+                    "description": "Left edge as percentage of screen width (0-100)"
+                },
+                "right_percent": {
+                    "type": "number",
+                    "description": "Right edge as percentage of screen width (0-100)"
                 }
-            ),
-            types.Tool(
-                name="get_system_info",
-                description="Get basic system information including macOS version, computer name, and memory",
-                inputSchema={
-                    "type": "object",
-                    "properties": {},
-                    "additionalProperties": False
+            },
+            "required": ["app_name", "left_percent", "right_percent"],
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="get_window_info",
+        description="Get information about the frontmost window including position and size",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "app_name": {
+                    "type": "string",
+                    "description": "Optional: specific application name to get info for"
                 }
-            )
-        ]
+            },
+            "additionalProperties": False
+        }
+    ),
+    types.Tool(
+        name="get_system_info",
+        description="Get basic system information including macOS version, computer name, and memory",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "additionalProperties": False
+        }
+    )
+]
+
+
+def get_tools() -> List[types.Tool]:
+    """Return list of macOS tool definitions."""
+    return _TOOLS
 
 async def handle_tool_call(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Handle macOS tool calls."""
@@ -143,16 +208,26 @@ async def _applescript_execute(arguments: Dict[str, Any]) -> List[types.TextCont
         return [types.TextContent(type="text", text=result)]
 
 async def _get_screen_resolution() -> List[types.TextContent]:
-        """Get screen resolution."""
-        script = '''
-        tell application "Finder"
-            set screenBounds to bounds of window of desktop
-            set screenWidth to item 3 of screenBounds
-            set screenHeight to item 4 of screenBounds
-            return "Resolution: " & screenWidth & "x" & screenHeight
-        end tell
-        '''
-        result = await execute_applescript(script)
+        """Get screen resolution.
+
+        Reads the main display size from CoreGraphics when PyObjC is
+        installed, otherwise asks Finder and caches the answer for
+        _SCREEN_CACHE_TTL seconds.
+        """
+        if CGMainDisplayID is not None:
+            display_id = CGMainDisplayID()
+            width, height = CGDisplayPixelsWide(display_id), CGDisplayPixelsHigh(display_id)
+            return [types.TextContent(type="text", text=f"Resolution: {width}x{height}")]
+
+        now = time.monotonic()
+        if _SCREEN_CACHE["value"] is not None and now - _SCREEN_CACHE["ts"] < _SCREEN_CACHE_TTL:
+            return [types.TextContent(type="text", text=_SCREEN_CACHE["value"])]
+
+        result = await execute_dispatcher("resolution")
+        # Only cache real answers, not error messages
+        if result.startswith("Resolution: "):
+            _SCREEN_CACHE["value"] = result
+            _SCREEN_CACHE["ts"] = now
         return [types.TextContent(type="text", text=result)]
 
 async def _foreground_window(app_name: str) -> List[types.TextContent]:
@@ -160,14 +235,131 @@ async def _foreground_window(app_name: str) -> List[types.TextContent]:
         if not app_name:
             return [types.TextContent(type="text", text="Error: app_name is required")]
 
-        script = f'''
-        tell application "{app_name}"
-            activate
-        end tell
-        '''
-        await execute_applescript(script)
+        # Activate in-process through AppKit when possible. Launching can wait
+        # on the app, so keep it off the event loop.
+        if NSWorkspace is None or not await asyncio.to_thread(_activate_app, app_name):
+            await execute_dispatcher("foreground", app_name)
         return [types.TextContent(type="text", text=f"Successfully brought {app_name} to foreground")]
 
+def _ax_available() -> bool:
+    """Whether the Accessibility API can be used to control windows."""
+    return (
+        NSWorkspace is not None
+        and CGWindowListCopyWindowInfo is not None
+        and AXUIElementCreateApplication is not None
+        and AXIsProcessTrusted()
+    )
+
+def _find_running_app(app_name: str):
+    """Find a running application with windows by its owner name.
+
+    Reads the window server's list on every call. NSWorkspace's
+    runningApplications is only refreshed by a Cocoa main run loop, which
+    this server does not run, so it would stay frozen at the first lookup.
+    """
+    if CGWindowListCopyWindowInfo is None:
+        return None
+    windows = CGWindowListCopyWindowInfo(
+        kCGWindowListOptionAll | kCGWindowListExcludeDesktopElements, kCGNullWindowID
+    ) or []
+    for info in windows:
+        if info.get(kCGWindowOwnerName) == app_name:
+            return NSRunningApplication.runningApplicationWithProcessIdentifier_(info[kCGWindowOwnerPID])
+    return None
+
+def _frontmost_app():
+    """Find the frontmost application through the system-wide AX element.
+
+    NSWorkspace's frontmostApplication is only refreshed by a Cocoa main
+    run loop, which this server does not run, so it is not used here.
+    """
+    err, app_element = AXUIElementCopyAttributeValue(
+        AXUIElementCreateSystemWide(), kAXFocusedApplicationAttribute, None
+    )
+    if err != kAXErrorSuccess or app_element is None:
+        return None
+    err, pid = AXUIElementGetPid(app_element, None)
+    if err != kAXErrorSuccess:
+        return None
+    return NSRunningApplication.runningApplicationWithProcessIdentifier_(pid)
+
+def _activate_app(app_name: str) -> bool:
+    """Activate a running app, or launch it if it is not running."""
+    app = _find_running_app(app_name)
+    if app is not None:
+        return bool(app.activateWithOptions_(NSApplicationActivateIgnoringOtherApps))
+    return bool(NSWorkspace.sharedWorkspace().launchApplication_(app_name))
+
+def _ax_front_window(pid: int):
+    """Return the focused (or first) AX window element of a process."""
+    app_element = AXUIElementCreateApplication(pid)
+    err, window = AXUIElementCopyAttributeValue(app_element, kAXFocusedWindowAttribute, None)
+    if err == kAXErrorSuccess and window is not None:
+        return window
+    err, windows = AXUIElementCopyAttributeValue(app_element, kAXWindowsAttribute, None)
+    if err == kAXErrorSuccess and windows:
+        return windows[0]
+    return None
+
+def _ax_dock_window(app_name: str, x_pos: int, width: int, height: int) -> Optional[str]:
+    """Activate an app and set its front window bounds through the Accessibility API.
+
+    Returns the process name on success, or None so the caller can fall
+    back to AppleScript (app not running, no window, or AX error).
+    """
+    try:
+        app = _find_running_app(app_name)
+        if app is None:
+            return None
+        app.activateWithOptions_(NSApplicationActivateIgnoringOtherApps)
+        window = _ax_front_window(app.processIdentifier())
+        if window is None:
+            return None
+        position = AXValueCreate(kAXValueCGPointType, (x_pos, 0))
+        size = AXValueCreate(kAXValueCGSizeType, (width, height))
+        if AXUIElementSetAttributeValue(window, kAXPositionAttribute, position) != kAXErrorSuccess:
+            return None
+        if AXUIElementSetAttributeValue(window, kAXSizeAttribute, size) != kAXErrorSuccess:
+            return None
+        return app.localizedName()
+    except Exception as e:
+        # PyObjC can raise (e.g. struct conversion); treat it like an AX error
+        logger.warning(f"Accessibility API failed to dock window ({e}), falling back to AppleScript")
+        return None
+
+def _ax_window_info(app_name: Optional[str]) -> Optional[str]:
+    """Describe a window's position and size through the Accessibility API.
+
+    Uses the given app, or the frontmost app when app_name is empty.
+    Returns None so the caller can fall back to AppleScript.
+    """
+    try:
+        if app_name:
+            app = _find_running_app(app_name)
+        else:
+            app = _frontmost_app()
+        if app is None:
+            return None
+        window = _ax_front_window(app.processIdentifier())
+        if window is None:
+            return None
+        err, position = AXUIElementCopyAttributeValue(window, kAXPositionAttribute, None)
+        if err != kAXErrorSuccess:
+            return None
+        err, size = AXUIElementCopyAttributeValue(window, kAXSizeAttribute, None)
+        if err != kAXErrorSuccess:
+            return None
+        _, point = AXValueGetValue(position, kAXValueCGPointType, None)
+        _, dimensions = AXValueGetValue(size, kAXValueCGSizeType, None)
+        info = f"Position: {int(point.x)},{int(point.y)} Size: {int(dimensions.width)}x{int(dimensions.height)}"
+        if app_name:
+            return info
+        return f"App: {app.localizedName()} {info}"
+    except Exception as e:
+        # PyObjC can raise (e.g. struct conversion); treat it like an AX error
+        logger.warning(f"Accessibility API failed to read window info ({e}), falling back to AppleScript")
+        return None
+
 async def _dock_window_horizontal(app_name: str, left_percent: float, right_percent: float) -> List[types.TextContent]:
     """Dock window horizontally using percentage bounds."""
     if not app_name or left_percent is None or right_percent is None:
@@ -180,88 +372,50 @@ async def _dock_window_horizontal(app_name: str, left_percent: float, right_perc
         return [types.TextContent(type="text", text="Error: left_percent must be less than right_percent")]
 
     # Get screen dimensions using existing function
-    try:
-        screen_result = await _get_screen_resolution()
-        resolution_text = screen_result[0].text  # "Resolution: 1352x878"
-        # Extract dimensions from "Resolution: WIDTHxHEIGHT"
-        dimensions = resolution_text.split(": ")[1]  # "1352x878"
-        screen_width, screen_height = map(int, dimensions.split('x'))
-    except (ValueError, IndexError, AttributeError):
-        return [types.TextContent(type="text", text=f"Error: Could not get screen dimensions")]
+    screen_result = await _get_screen_resolution()
+    resolution_text = screen_result[0].text  # "Resolution: 1352x878"
+    m = _RES_RE.search(resolution_text)
+    if not m:
+        return [types.TextContent(type="text", text="Error: Could not get screen dimensions")]
+    screen_width, screen_height = int(m.group(1)), int(m.group(2))
 
     # Calculate window bounds
     x_pos = int(screen_width * left_percent / 100)
     window_width = int(screen_width * (right_percent - left_percent) / 100)
 
-    # First try to activate the application and get the process name
-    activate_script = f'''
-    tell application "{app_name}" to activate
-    delay 0.5
-    tell application "System Events"
-        set frontApp to name of first application process whose frontmost is true
-        return frontApp
-    end tell
-    '''
+    # Move the window in-process via Accessibility when possible. AX calls
+    # are synchronous IPC to the target app, so keep them off the event loop.
+    process_name = None
+    if _ax_available():
+        process_name = await asyncio.to_thread(
+            _ax_dock_window, app_name, x_pos, window_width, screen_height
+        )
 
-    try:
-        process_name = await execute_applescript(activate_script)
-        process_name = process_name.strip()
-    except Exception:
-        process_name = app_name  # Fallback to provided name
-
-    # Now dock the window using the actual process name
-    script = f'''
-    tell application "System Events"
-        tell application process "{process_name}"
-            set frontWindow to front window
-            set position of frontWindow to {{{x_pos}, 0}}
-            set size of frontWindow to {{{window_width}, {screen_height}}}
-        end tell
-    end tell
-    '''
-
-    await execute_applescript(script)
+    if process_name is None:
+        # Activate the application and dock its front window in a single script
+        process_name = await execute_dispatcher(
+            "dock", app_name, str(x_pos), str(window_width), str(screen_height)
+        )
     return [types.TextContent(type="text", text=f"Window docked horizontally: {left_percent}%-{right_percent}% ({x_pos},{window_width}x{screen_height}) Process: {process_name}")]
 
 async def _get_window_info(app_name: str = None) -> List[types.TextContent]:
         """Get window information."""
+        if _ax_available():
+            result = await asyncio.to_thread(_ax_window_info, app_name)
+            if result is not None:
+                return [types.TextContent(type="text", text=result)]
+
         if app_name:
-            script = f'''
-            tell application "System Events"
-                tell process "{app_name}"
-                    tell window 1
-                        set windowPos to position
-                        set windowSize to size
-                        return "Position: " & item 1 of windowPos & "," & item 2 of windowPos & " Size: " & item 1 of windowSize & "x" & item 2 of windowSize
-                    end tell
-                end tell
-            end tell
-            '''
+            result = await execute_dispatcher("info", app_name)
         else:
-            script = '''
-            tell application "System Events"
-                set frontApp to name of first application process whose frontmost is true
-                tell process frontApp
-                    tell window 1
-                        set windowPos to position
-                        set windowSize to size
-                        return "App: " & frontApp & " Position: " & item 1 of windowPos & "," & item 2 of windowPos & " Size: " & item 1 of windowSize & "x" & item 2 of windowSize
-                    end tell
-                end tell
-            end tell
-            '''
-
-        result = await execute_applescript(script)
+            result = await execute_dispatcher("info")
+
         return [types.TextContent(type="text", text=result)]
 
 async def _get_system_info() -> List[types.TextContent]:
-        """Get system information."""
-        script = '''
-        set computerName to computer name of (system info)
-        set osVersion to system version of (system info)
-        set totalMemory to (physical memory of (system info)) / 1024 / 1024
-        return "Computer: " & computerName & " macOS: " & osVersion & " Memory: " & totalMemory & "MB"
-        '''
-
-        result = await execute_applescript(script)
-        return [types.TextContent(type="text", text=result)]
\ No newline at end of file
+        """Get system information without spawning osascript."""
+        computer_name = socket.gethostname()
+        os_version = platform.mac_ver()[0] or platform.release()
+        total_memory = os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE') // (1024 * 1024)
+        result = f"Computer: {computer_name} macOS: {os_version} Memory: {total_memory}MB"
+        return [types.TextContent(type="text", text=result)]
@@ -1,5 +1,23 @@
 """Utilities package for AppleScript execution and other helper functions."""
 
-from .applescript import execute_applescript
+from .applescript import (
+    ScriptRunnerPool,
+    compile_applescript,
+    execute_applescript,
+    execute_compiled_applescript,
+    execute_dispatcher,
+    prepare_dispatcher,
+    start_runner_pool,
+    stop_runner_pool,
+)
 
-__all__ = ["execute_applescript"]
\ No newline at end of file
+__all__ = [
+    "ScriptRunnerPool",
+    "compile_applescript",
+    "execute_applescript",
+    "execute_compiled_applescript",
+    "execute_dispatcher",
+    "prepare_dispatcher",
+    "start_runner_pool",
+    "stop_runner_pool",
+]
@@ -1,21 +1,345 @@
 """AppleScript execution utilities."""
 
+import asyncio
+import atexit
+import hashlib
+import logging
 import os
+import shutil
 import tempfile
-import subprocess
-import logging
-from typing import Optional
+import uuid
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer setting from the environment, falling back to default."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        return max(1, int(value))
+    except ValueError:
+        logger.warning(f"Ignoring invalid {name}={value!r}, using {default}")
+        return default
+
+
+_OSASCRIPT = "/usr/bin/osascript"
+_OSACOMPILE = "/usr/bin/osacompile"
+
+# Compiled .scpt files, keyed by the AppleScript source they were built from.
+# None records a failed compile so later calls pipe the source straight away.
+_compiled_scripts: Dict[str, Optional[str]] = {}
+# Compiles in flight, shared by concurrent callers with the same source
+_pending_compiles: Dict[str, asyncio.Task] = {}
+_compiled_dir: Optional[str] = None
+
+# AppleScript implementing the built-in tools, see execute_dispatcher
+_DISPATCHER_PATH = os.path.join(os.path.dirname(__file__), "dispatcher.applescript")
+_dispatcher_source: Optional[str] = None
+
+# Caps concurrent osascript/osacompile processes. AppleEvents to System
+# Events are largely serialized anyway, so queueing here is cheaper than
+# oversubscribing the OS.
+_OSASCRIPT_SEM = asyncio.Semaphore(_env_int("APPLESCRIPT_MCP_CONCURRENCY", 4))
+
+# Output beyond this many bytes is dropped so one script cannot exhaust memory
+_MAX_OUTPUT_BYTES = _env_int("APPLESCRIPT_MCP_MAX_OUTPUT", 4 * 1024 * 1024)
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+class ScriptRunnerPool:
+    """
+    Pool of osascript processes spawned ahead of time.
+
+    osascript runs a single script per process and only starts once stdin
+    is closed, so runners cannot be reused. Instead each idle runner has
+    already paid the exec and framework loading cost and is waiting for
+    its script on stdin; once handed out it is replaced in the background.
+    """
+
+    def __init__(self, size: int = 2):
+        self.size = size
+        self._idle: List[asyncio.subprocess.Process] = []
+        self._refills: Set[asyncio.Task] = set()
+        self._running = False
+
+    async def start(self) -> None:
+        """Spawn the initial set of idle runners."""
+        self._running = True
+        for _ in range(self.size):
+            await self._refill()
+        logger.debug(f"Started osascript runner pool with {len(self._idle)} runners")
+
+    async def close(self) -> None:
+        """Stop refilling the pool and kill any idle runners."""
+        self._running = False
+        # Let in-flight refills finish; they kill their runner once stopped
+        await asyncio.gather(*self._refills, return_exceptions=True)
+        idle, self._idle = self._idle, []
+        for proc in idle:
+            if proc.returncode is None:
+                proc.kill()
+            await proc.wait()
+
+    def acquire(self) -> Optional[asyncio.subprocess.Process]:
+        """
+        Take an idle runner out of the pool.
+
+        Returns:
+            A live osascript process waiting for a script on stdin, or None
+            if the pool is not running or has no live runners left
+        """
+        while self._idle:
+            proc = self._idle.pop()
+            self._schedule_refill()
+            if proc.returncode is None:
+                return proc
+            logger.warning(f"Discarding dead osascript runner (exit code {proc.returncode})")
+        return None
+
+    def _schedule_refill(self) -> None:
+        if not self._running:
+            return
+        task = asyncio.create_task(self._refill())
+        self._refills.add(task)
+        task.add_done_callback(self._refills.discard)
+
+    async def _refill(self) -> None:
+        try:
+            proc = await _spawn_osascript("-")
+        except Exception as e:
+            logger.warning(f"Failed to spawn osascript runner: {str(e)}")
+            return
+        if self._running and len(self._idle) < self.size:
+            self._idle.append(proc)
+        else:
+            proc.kill()
+            await proc.wait()
+
+
+_runner_pool: Optional[ScriptRunnerPool] = None
+
+
+async def start_runner_pool(size: int = 2) -> ScriptRunnerPool:
+    """Start the shared osascript runner pool used by execute_applescript."""
+    global _runner_pool
+    if _runner_pool is None:
+        _runner_pool = ScriptRunnerPool(size)
+        await _runner_pool.start()
+    return _runner_pool
+
+
+async def stop_runner_pool() -> None:
+    """Shut down the shared osascript runner pool, if it was started."""
+    global _runner_pool
+    if _runner_pool is not None:
+        pool, _runner_pool = _runner_pool, None
+        await pool.close()
+
+
+async def _spawn_osascript(*args: str, stdin: int = asyncio.subprocess.PIPE) -> asyncio.subprocess.Process:
+    return await asyncio.create_subprocess_exec(
+        _OSASCRIPT,
+        *args,
+        stdin=stdin,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+
+
+async def _kill_if_running(proc: asyncio.subprocess.Process) -> None:
+    """Kill and reap a child process that has not exited yet."""
+    if proc.returncode is None:
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+        await proc.wait()
+
+
+def _remove_partial_output(path: str) -> None:
+    """Delete a temporary .scpt left behind by an osacompile run, if any."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+async def compile_applescript(code: str, timeout: int = 60) -> Optional[str]:
+    """
+    Compile AppleScript source to a .scpt file with osacompile.
+
+    Results are cached per source for the lifetime of the process, so
+    repeated calls with the same script only pay for compilation once.
+    Deterministic failures (osacompile missing or exiting non-zero) are
+    cached too; timeouts and other transient errors are not, so a later
+    call tries again. Concurrent calls for a source that is still being
+    compiled wait for that compile instead of starting another.
+
+    Args:
+        code: The AppleScript code to compile
+        timeout: Compilation timeout in seconds (default: 60)
+
+    Returns:
+        Path to the compiled script, or None if compilation failed
+    """
+    if code in _compiled_scripts:
+        return _compiled_scripts[code]
+
+    task = _pending_compiles.get(code)
+    if task is None:
+        task = asyncio.ensure_future(_compile(code, timeout))
+        _pending_compiles[code] = task
+        task.add_done_callback(lambda done: _finish_compile(code, done))
+
+    # Shield the shared compile so one cancelled caller does not abort it for the others
+    try:
+        return await asyncio.shield(task)
+    except Exception:
+        # Transient failure, already logged by _compile; pipe the source this time
+        return None
+
+
+def _finish_compile(code: str, task: asyncio.Task) -> None:
+    _pending_compiles.pop(code, None)
+    if not task.cancelled() and task.exception() is None:
+        _compiled_scripts[code] = task.result()
+
+
+async def _compile(code: str, timeout: int) -> Optional[str]:
+    global _compiled_dir
+    if _compiled_dir is None:
+        _compiled_dir = tempfile.mkdtemp(prefix="applescript-mcp-")
+        atexit.register(shutil.rmtree, _compiled_dir, True)
+
+    digest = hashlib.sha1(code.encode('utf-8')).hexdigest()
+    compiled_path = os.path.join(_compiled_dir, f"{digest}.scpt")
+    # Build under a unique name and only move it into place once complete,
+    # so a cached path never points at a half-written file
+    temp_path = os.path.join(_compiled_dir, f"{digest}.{uuid.uuid4().hex}.scpt")
+
+    async def run() -> Tuple[bytes, int]:
+        async with _OSASCRIPT_SEM:
+            # osacompile reads the script source from stdin when no file is given
+            proc = await asyncio.create_subprocess_exec(
+                _OSACOMPILE,
+                "-o",
+                temp_path,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                _, stderr = await proc.communicate(input=code.encode('utf-8'))
+                return stderr, proc.returncode
+            finally:
+                await _kill_if_running(proc)
+
+    try:
+        try:
+            # The deadline also covers waiting for a free slot in _OSASCRIPT_SEM
+            stderr, returncode = await asyncio.wait_for(run(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"AppleScript compilation timed out after {timeout} seconds")
+            raise
+        except OSError as e:
+            # osacompile is missing or not executable; this will not change
+            logger.warning(f"Error compiling AppleScript: {str(e)}")
+            return None
+        except Exception as e:
+            logger.warning(f"Error compiling AppleScript: {str(e)}")
+            raise
+
+        if returncode != 0:
+            logger.warning(f"AppleScript compilation failed: {stderr.decode()}")
+            return None
+
+        os.replace(temp_path, compiled_path)
+    finally:
+        # Only this compile's own output is ever removed; once moved into
+        # place the compiled script may already be in use by other calls.
+        # Also covers cancellation and a failed os.replace.
+        _remove_partial_output(temp_path)
+
+    logger.debug(f"Compiled AppleScript to {compiled_path}")
+    return compiled_path
+
+
+async def _read_limited(stream: asyncio.StreamReader, limit: int) -> Tuple[bytes, bool]:
+    """Read a stream to EOF, keeping at most limit bytes and draining the rest."""
+    buffer = bytearray()
+    truncated = False
+    while True:
+        chunk = await stream.read(_READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        remaining = limit - len(buffer)
+        if len(chunk) > remaining:
+            truncated = True
+            chunk = chunk[:max(remaining, 0)]
+        buffer += chunk
+    return bytes(buffer), truncated
+
+
+async def _write_stdin(proc: asyncio.subprocess.Process, data: Optional[bytes]) -> None:
+    if proc.stdin is None:
+        return
+    try:
+        if data:
+            proc.stdin.write(data)
+            await proc.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError):
+        # osascript exited early; its stderr explains why
+        pass
+    finally:
+        proc.stdin.close()
+
+
+async def _stream_output(
+    proc: asyncio.subprocess.Process,
+    script_input: Optional[bytes]
+) -> Tuple[str, str, bool]:
+    """
+    Feed the script to a running osascript and collect its output.
+
+    stdout and stderr are read incrementally while stdin is written, so
+    large outputs neither deadlock the pipes nor grow past
+    _MAX_OUTPUT_BYTES in memory.
+
+    Returns:
+        Tuple of (stdout, stderr, stdout_truncated)
+    """
+    _, (stdout, truncated), (stderr, _) = await asyncio.gather(
+        _write_stdin(proc, script_input),
+        _read_limited(proc.stdout, _MAX_OUTPUT_BYTES),
+        _read_limited(proc.stderr, _MAX_OUTPUT_BYTES)
+    )
+    await proc.wait()
+    return stdout.decode(errors='replace'), stderr.decode(errors='replace'), truncated
 
-async def execute_applescript(code: str, timeout: int = 60) -> str:
+
+async def execute_applescript(
+    code: str,
+    timeout: int = 60,
+    args: Sequence[str] = (),
+    compiled_path: Optional[str] = None
+) -> str:
     """
     Execute AppleScript code and return the result.
 
+    The script source is piped to osascript on stdin, so no temporary
+    file is written per call. Scripts without arguments are handed to an
+    idle runner from the pool when one is available. When compiled_path
+    is given, the compiled script is run instead and code is not parsed
+    again. Output is read as it is produced and capped at
+    APPLESCRIPT_MCP_MAX_OUTPUT bytes (default: 4 MB).
+
     Args:
         code: The AppleScript code to execute
         timeout: Execution timeout in seconds (default: 60)
+        args: Arguments passed to the script's run handler as argv
+        compiled_path: Optional path to a compiled version of code
 
     Returns:
         The output from the AppleScript execution
@@ -25,42 +349,114 @@ async def execute_applescript(code: str, timeout: int = 60) -> str:
     """
     logger.debug(f"Executing AppleScript with timeout {timeout}s")
 
-    # Create temp file for the AppleScript
-    with tempfile.NamedTemporaryFile(suffix='.scpt', delete=False) as temp:
-        temp_path = temp.name
-        try:
-            # Write the AppleScript to the temp file
-            temp.write(code.encode('utf-8'))
-            temp.flush()
-
-            # Execute the AppleScript
-            cmd = ["/usr/bin/osascript", temp_path]
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
+    if compiled_path is not None:
+        script_args = [compiled_path, *args]
+        script_input = None
+    else:
+        script_args = ["-", *args]
+        script_input = code.encode('utf-8')
+
+    async def run() -> Tuple[str, str, bool, int]:
+        # Bound how many osascript processes run at once
+        async with _OSASCRIPT_SEM:
+            # Execute the AppleScript without blocking the event loop
+            proc = None
+            try:
+                if script_input is not None and not args and _runner_pool is not None:
+                    proc = _runner_pool.acquire()
+                if proc is None:
+                    proc = await _spawn_osascript(
+                        *script_args,
+                        stdin=asyncio.subprocess.PIPE if script_input is not None else asyncio.subprocess.DEVNULL
+                    )
+                stdout, stderr, truncated = await _stream_output(proc, script_input)
+                return stdout, stderr, truncated, proc.returncode
+            finally:
+                # Never leave osascript running behind a timed-out, failed or
+                # cancelled call (MCP cancels handlers on notifications/cancelled)
+                if proc is not None:
+                    await _kill_if_running(proc)
 
-            if result.returncode != 0:
-                error_message = f"AppleScript execution failed: {result.stderr}"
-                logger.error(error_message)
-                return error_message
+    try:
+        # The deadline also covers waiting for a free slot in _OSASCRIPT_SEM
+        stdout, stderr, truncated, returncode = await asyncio.wait_for(run(), timeout=timeout)
+    except asyncio.TimeoutError:
+        error_message = f"AppleScript execution timed out after {timeout} seconds"
+        logger.error(error_message)
+        return error_message
+    except Exception as e:
+        error_message = f"Error executing AppleScript: {str(e)}"
+        logger.error(error_message)
+        return error_message
 
-            logger.debug("AppleScript executed successfully")
-            return result.stdout.strip()
+    if returncode != 0:
+        error_message = f"AppleScript execution failed: {stderr}"
+        logger.error(error_message)
+        return error_message
 
-        except subprocess.TimeoutExpired:
-            error_message = f"AppleScript execution timed out after {timeout} seconds"
-            logger.error(error_message)
-            return error_message
-        except Exception as e:
-            error_message = f"Error executing AppleScript: {str(e)}"
-            logger.error(error_message)
-            return error_message
-        finally:
-            # Clean up the temporary file
-            try:
-                os.unlink(temp_path)
-            except Exception as e:
-                logger.warning(f"Failed to delete temporary file: {e}")
\ No newline at end of file
+    logger.debug("AppleScript executed successfully")
+    if truncated:
+        logger.warning(f"AppleScript output truncated to {_MAX_OUTPUT_BYTES} bytes")
+        return f"{stdout.strip()}\n[Output truncated after {_MAX_OUTPUT_BYTES} bytes]"
+    return stdout.strip()
+
+
+async def execute_compiled_applescript(code: str, *args: str, timeout: int = 60) -> str:
+    """
+    Compile AppleScript code once and execute the cached compiled script.
+
+    Values that vary between calls should be passed as args and read with
+    an ``on run argv`` handler, so one compiled script serves every call.
+    Falls back to piping the source if compilation fails.
+
+    Args:
+        code: The AppleScript code to execute
+        *args: Arguments passed to the script's run handler as argv
+        timeout: Execution timeout in seconds (default: 60)
+
+    Returns:
+        The output from the AppleScript execution
+    """
+    compiled_path = await compile_applescript(code, timeout)
+    return await execute_applescript(code, timeout, args=args, compiled_path=compiled_path)
+
+
+def _load_dispatcher() -> str:
+    global _dispatcher_source
+    if _dispatcher_source is None:
+        with open(_DISPATCHER_PATH, encoding='utf-8') as f:
+            _dispatcher_source = f.read()
+    return _dispatcher_source
+
+
+async def prepare_dispatcher() -> Optional[str]:
+    """
+    Compile the dispatcher script ahead of the first tool call.
+
+    Overlapping tool calls would otherwise all wait on the same first
+    compile; doing it at startup keeps that off the request path.
+
+    Returns:
+        Path to the compiled dispatcher, or None if compilation failed
+    """
+    return await compile_applescript(_load_dispatcher())
+
+
+async def execute_dispatcher(cmd: str, *args: str, timeout: int = 60) -> str:
+    """
+    Run a command of the bundled dispatcher script.
+
+    All built-in tool scripts live as handlers in dispatcher.applescript,
+    so a single compiled script serves every command and the source is
+    only read and compiled once per process, even when several tool calls
+    overlap.
+
+    Args:
+        cmd: Dispatcher command ("resolution", "foreground", "dock", "info")
+        *args: Arguments for the command
+        timeout: Execution timeout in seconds (default: 60)
+
+    Returns:
+        The output from the dispatcher command
+    """
+    return await execute_compiled_applescript(_load_dispatcher(), cmd, *args, timeout=timeout)
@@ -0,0 +1,251 @@
+"""Tests for the osascript runner, using stub binaries so they run off macOS."""
+
+import asyncio
+import os
+import stat
+import sys
+import time
+
+import pytest
+
+import applescript_mcp.utils.applescript as applescript
+
+# Echoes the script (stdin or file) followed by its argv, like a trivial
+# AppleScript that returns its source. "sleep" scripts hang, "fail" scripts
+# exit non-zero, and "big:<n>" scripts print n bytes.
+OSASCRIPT_STUB = '''
+import os, sys, time
+with open(os.environ["STUB_LOG"], "a") as log:
+    log.write("osascript\\n")
+args = sys.argv[1:]
+source = sys.stdin.read() if args[0] == "-" else open(args[0]).read()
+if source.startswith("sleep"):
+    time.sleep(30)
+if source.startswith("fail"):
+    sys.stderr.write("script error")
+    sys.exit(1)
+if source.startswith("big:"):
+    sys.stdout.write("x" * int(source[4:]))
+    sys.exit(0)
+print(source + "|" + " ".join(args[1:]))
+'''
+
+# Copies stdin to the -o path after a short delay, so concurrent compiles overlap;
+# "slow" scripts take long enough to time out
+OSACOMPILE_STUB = '''
+import os, sys, time
+with open(os.environ["STUB_LOG"], "a") as log:
+    log.write("osacompile\\n")
+source = sys.stdin.read()
+time.sleep(5 if source.startswith("slow") else 0.2)
+if source.startswith("fail"):
+    sys.exit(1)
+with open(sys.argv[2], "w") as f:
+    f.write(source)
+'''
+
+
+def _write_stub(path, body):
+    path.write_text(f"#!{sys.executable}\n{body}")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+
+@pytest.fixture
+def stubs(tmp_path, monkeypatch):
+    """Point the runner at stub binaries and reset module-level state."""
+    log = tmp_path / "calls.log"
+    log.write_text("")
+    monkeypatch.setenv("STUB_LOG", str(log))
+    monkeypatch.setattr(applescript, "_OSASCRIPT", _write_stub(tmp_path / "osascript", OSASCRIPT_STUB))
+    monkeypatch.setattr(applescript, "_OSACOMPILE", _write_stub(tmp_path / "osacompile", OSACOMPILE_STUB))
+    monkeypatch.setattr(applescript, "_OSASCRIPT_SEM", asyncio.Semaphore(4))
+    monkeypatch.setattr(applescript, "_compiled_scripts", {})
+    monkeypatch.setattr(applescript, "_pending_compiles", {})
+    monkeypatch.setattr(applescript, "_runner_pool", None)
+    return lambda: log.read_text().split()
+
+
+def test_execute_pipes_source_and_args(stubs):
+    result = asyncio.run(applescript.execute_applescript("hello", args=("a", "b")))
+    assert result == "hello|a b"
+
+
+def test_execute_reports_failure(stubs):
+    result = asyncio.run(applescript.execute_applescript("fail"))
+    assert result == "AppleScript execution failed: script error"
+
+
+def test_execute_truncates_large_output(stubs, monkeypatch):
+    monkeypatch.setattr(applescript, "_MAX_OUTPUT_BYTES", 1000)
+    result = asyncio.run(applescript.execute_applescript("big:200000"))
+    assert result == "x" * 1000 + "\n[Output truncated after 1000 bytes]"
+
+
+def test_execute_keeps_output_under_limit(stubs):
+    result = asyncio.run(applescript.execute_applescript("big:200000"))
+    assert result == "x" * 200000
+
+
+def test_execute_timeout_kills_process(stubs):
+    start = time.monotonic()
+    result = asyncio.run(applescript.execute_applescript("sleep", timeout=1))
+    assert result == "AppleScript execution timed out after 1 seconds"
+    assert time.monotonic() - start < 10
+
+
+def test_timeout_covers_waiting_for_a_slot(stubs, monkeypatch):
+    monkeypatch.setattr(applescript, "_OSASCRIPT_SEM", asyncio.Semaphore(1))
+
+    async def run():
+        blocker = asyncio.create_task(applescript.execute_applescript("sleep", timeout=30))
+        await asyncio.sleep(0.5)
+        start = time.monotonic()
+        result = await applescript.execute_applescript("queued", timeout=1)
+        elapsed = time.monotonic() - start
+        blocker.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await blocker
+        return result, elapsed
+
+    result, elapsed = asyncio.run(run())
+    assert result == "AppleScript execution timed out after 1 seconds"
+    assert elapsed < 5
+
+
+@pytest.mark.parametrize("value, expected", [(None, 4), ("8", 8), ("0", 1), ("-3", 1), ("lots", 4)])
+def test_env_int(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv("APPLESCRIPT_MCP_TEST_INT", raising=False)
+    else:
+        monkeypatch.setenv("APPLESCRIPT_MCP_TEST_INT", value)
+    assert applescript._env_int("APPLESCRIPT_MCP_TEST_INT", 4) == expected
+
+
+def _track_spawns(monkeypatch):
+    spawned = []
+    spawn = applescript._spawn_osascript
+
+    async def tracking_spawn(*args, **kwargs):
+        proc = await spawn(*args, **kwargs)
+        spawned.append(proc)
+        return proc
+
+    monkeypatch.setattr(applescript, "_spawn_osascript", tracking_spawn)
+    return spawned
+
+
+def _assert_reaped(proc):
+    assert proc.returncode is not None
+    with pytest.raises(ProcessLookupError):
+        os.kill(proc.pid, 0)
+
+
+def test_cancelled_execute_kills_process(stubs, monkeypatch):
+    spawned = _track_spawns(monkeypatch)
+
+    async def run():
+        task = asyncio.create_task(applescript.execute_applescript("sleep"))
+        await asyncio.sleep(1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert len(spawned) == 1
+    _assert_reaped(spawned[0])
+
+
+def test_cancelled_execute_kills_pooled_runner(stubs, monkeypatch):
+    async def run():
+        pool = await applescript.start_runner_pool(1)
+        try:
+            runner = pool._idle[0]
+            task = asyncio.create_task(applescript.execute_applescript("sleep"))
+            await asyncio.sleep(1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return runner
+        finally:
+            await applescript.stop_runner_pool()
+
+    _assert_reaped(asyncio.run(run()))
+
+
+def test_pooled_runner_handoff(stubs):
+    async def run():
+        pool = await applescript.start_runner_pool(2)
+        try:
+            assert len(pool._idle) == 2
+            acquired = []
+            acquire = pool.acquire
+            pool.acquire = lambda: acquired.append(acquire()) or acquired[-1]
+            first = await applescript.execute_applescript("one")
+            second = await applescript.execute_applescript("two")
+            # Both scripts ran in runners that were spawned ahead of time
+            assert len(acquired) == 2 and None not in acquired
+            await asyncio.gather(*pool._refills)
+            assert len(pool._idle) == 2
+            return first, second, list(pool._idle)
+        finally:
+            await applescript.stop_runner_pool()
+
+    first, second, leftover = asyncio.run(run())
+    assert (first, second) == ("one|", "two|")
+    assert all(proc.returncode is not None for proc in leftover)
+    assert applescript._runner_pool is None
+
+
+def test_dead_runner_falls_back_to_spawn(stubs):
+    async def run():
+        pool = await applescript.start_runner_pool(1)
+        try:
+            for proc in pool._idle:
+                proc.kill()
+                await proc.wait()
+            return await applescript.execute_applescript("after")
+        finally:
+            await applescript.stop_runner_pool()
+
+    assert asyncio.run(run()) == "after|"
+
+
+def test_concurrent_compiles_are_shared(stubs):
+    async def run():
+        return await asyncio.gather(
+            applescript.execute_compiled_applescript("shared", "1"),
+            applescript.execute_compiled_applescript("shared", "2"),
+        )
+
+    assert asyncio.run(run()) == ["shared|1", "shared|2"]
+    assert stubs() == ["osacompile", "osascript", "osascript"]
+    compiled_path = applescript._compiled_scripts["shared"]
+    with open(compiled_path) as f:
+        assert f.read() == "shared"
+    # Only final <sha1>.scpt files remain; no temporary compile output is left behind
+    assert all(name.count(".") == 1 for name in os.listdir(os.path.dirname(compiled_path)))
+
+
+def test_failed_compile_is_cached(stubs):
+    async def run():
+        return [await applescript.execute_compiled_applescript("fail-compile", "x") for _ in range(3)]
+
+    # The source is piped instead; the stub osascript treats it as a failing script
+    assert asyncio.run(run()) == ["AppleScript execution failed: script error"] * 3
+    assert stubs() == ["osacompile", "osascript", "osascript", "osascript"]
+    assert applescript._compiled_scripts == {"fail-compile": None}
+
+
+def test_missing_osacompile_is_cached(stubs, monkeypatch, tmp_path):
+    monkeypatch.setattr(applescript, "_OSACOMPILE", str(tmp_path / "missing"))
+    assert asyncio.run(applescript.execute_compiled_applescript("no-compiler", "x")) == "no-compiler|x"
+    assert applescript._compiled_scripts == {"no-compiler": None}
+
+
+def test_timed_out_compile_is_not_cached(stubs):
+    result = asyncio.run(applescript.execute_compiled_applescript("slow", "x", timeout=1))
+    # The source was piped instead, and the next call will try compiling again
+    assert result == "slow|x"
+    assert "slow" not in applescript._compiled_scripts
+    assert applescript._pending_compiles == {}
@@ -0,0 +1,60 @@
+"""Tests for the command-line entry point and logging setup."""
+
+import logging
+
+import pytest
+
+import applescript_mcp
+from applescript_mcp import server
+
+
+@pytest.fixture
+def restore_logging():
+    """Undo configure_logging's changes to the root and package loggers."""
+    root = logging.getLogger()
+    saved = root.handlers[:], root.level, server.logger.level
+    yield
+    root.handlers[:], root.level, server.logger.level = saved
+
+
+@pytest.fixture
+def fake_server_main(monkeypatch):
+    """Replace server.main so main() parses arguments without starting the server."""
+    calls = []
+
+    async def fake_main(access_token=None, log_level='INFO'):
+        calls.append((access_token, log_level))
+        server.configure_logging(log_level)
+
+    monkeypatch.setattr(server, "main", fake_main)
+    monkeypatch.delenv("LOG_LEVEL", raising=False)
+    return calls
+
+
+def test_log_level_flag_takes_effect(fake_server_main, restore_logging, monkeypatch):
+    monkeypatch.setattr("sys.argv", ["applescript-mcp", "--log-level", "debug", "--access-token", "t"])
+
+    applescript_mcp.main()
+
+    assert fake_server_main == [("t", "debug")]
+    assert logging.getLogger().level == logging.DEBUG
+    assert server.logger.isEnabledFor(logging.DEBUG)
+
+
+def test_log_level_defaults_to_environment(fake_server_main, restore_logging, monkeypatch):
+    monkeypatch.setattr("sys.argv", ["applescript-mcp"])
+    monkeypatch.setenv("LOG_LEVEL", "WARNING")
+
+    applescript_mcp.main()
+
+    assert fake_server_main == [(None, "WARNING")]
+    assert logging.getLogger().level == logging.WARNING
+    assert not server.logger.isEnabledFor(logging.INFO)
+
+
+def test_configure_logging_overrides_earlier_setup(restore_logging):
+    logging.basicConfig(level=logging.ERROR)
+
+    server.configure_logging("DEBUG")
+
+    assert logging.getLogger().level == logging.DEBUG
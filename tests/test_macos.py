@@ -0,0 +1,132 @@
+"""Tests for the macOS tool handlers, with AppleScript and PyObjC calls patched out."""
+
+import asyncio
+
+import pytest
+
+import applescript_mcp.tools.macos as macos
+
+
+@pytest.fixture
+def dispatcher(monkeypatch):
+    """Record dispatcher calls and answer them from a dict of canned results."""
+    calls = []
+    results = {}
+
+    async def fake_execute_dispatcher(cmd, *args, timeout=60):
+        calls.append((cmd, *args))
+        return results.get(cmd, "")
+
+    monkeypatch.setattr(macos, "execute_dispatcher", fake_execute_dispatcher)
+    monkeypatch.setattr(macos, "_ax_available", lambda: False)
+    monkeypatch.setattr(macos, "CGMainDisplayID", None)
+    monkeypatch.setattr(macos, "_SCREEN_CACHE", {"value": None, "ts": 0.0})
+    return calls, results
+
+
+def _text(result):
+    assert len(result) == 1
+    return result[0].text
+
+
+def test_ax_exceptions_fall_back_to_applescript(dispatcher, monkeypatch):
+    calls, results = dispatcher
+    results["resolution"] = "Resolution: 1000x800"
+    results["info"] = "App: Finder Position: 0,0 Size: 10x10"
+
+    def broken_lookup(app_name=None):
+        raise TypeError("struct conversion failed")
+
+    monkeypatch.setattr(macos, "_ax_available", lambda: True)
+    monkeypatch.setattr(macos, "_find_running_app", broken_lookup)
+    monkeypatch.setattr(macos, "_frontmost_app", broken_lookup)
+
+    docked = _text(asyncio.run(macos.handle_tool_call(
+        "dock_window_horizontal", {"app_name": "Safari", "left_percent": 0, "right_percent": 50}
+    )))
+    info = _text(asyncio.run(macos.handle_tool_call("get_window_info", {})))
+
+    assert docked.startswith("Window docked horizontally")
+    assert info == "App: Finder Position: 0,0 Size: 10x10"
+    assert [call[0] for call in calls] == ["resolution", "dock", "info"]
+
+
+def test_screen_resolution_is_cached_for_ttl(dispatcher, monkeypatch):
+    calls, results = dispatcher
+    results["resolution"] = "Resolution: 1440x900"
+    now = [1000.0]
+    monkeypatch.setattr(macos, "time", type("FakeTime", (), {"monotonic": staticmethod(lambda: now[0])}))
+
+    assert _text(asyncio.run(macos._get_screen_resolution())) == "Resolution: 1440x900"
+    results["resolution"] = "Resolution: 2560x1440"
+    now[0] += macos._SCREEN_CACHE_TTL - 1
+    assert _text(asyncio.run(macos._get_screen_resolution())) == "Resolution: 1440x900"
+    now[0] += 2
+    assert _text(asyncio.run(macos._get_screen_resolution())) == "Resolution: 2560x1440"
+    assert calls == [("resolution",), ("resolution",)]
+
+
+def test_screen_resolution_errors_are_not_cached(dispatcher):
+    calls, results = dispatcher
+    results["resolution"] = "AppleScript execution failed: Finder got an error"
+
+    for _ in range(2):
+        assert _text(asyncio.run(macos._get_screen_resolution())).startswith("AppleScript execution failed")
+    assert calls == [("resolution",), ("resolution",)]
+    assert macos._SCREEN_CACHE["value"] is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Resolution: 1920x1080", ("1920", "1080")),
+    ("Resolution:2560x1440", ("2560", "1440")),
+    ("AppleScript execution failed: no display", None),
+    ("Resolution: unknown", None),
+])
+def test_resolution_regex(text, expected):
+    m = macos._RES_RE.search(text)
+    assert (m.groups() if m else None) == expected
+
+
+def test_dock_reports_unparseable_resolution(dispatcher):
+    calls, results = dispatcher
+    results["resolution"] = "AppleScript execution failed: no display"
+
+    result = _text(asyncio.run(macos.handle_tool_call(
+        "dock_window_horizontal", {"app_name": "Safari", "left_percent": 0, "right_percent": 50}
+    )))
+
+    assert result == "Error: Could not get screen dimensions"
+    assert calls == [("resolution",)]
+
+
+def test_system_info_format(monkeypatch):
+    sysconf = {"SC_PHYS_PAGES": 4 * 1024 * 1024, "SC_PAGE_SIZE": 4096}
+    monkeypatch.setattr(macos.socket, "gethostname", lambda: "studio.local")
+    monkeypatch.setattr(macos.platform, "mac_ver", lambda: ("14.5", ("", "", ""), "arm64"))
+    monkeypatch.setattr(macos.os, "sysconf", sysconf.__getitem__)
+
+    result = _text(asyncio.run(macos.handle_tool_call("get_system_info", {})))
+
+    assert result == "Computer: studio.local macOS: 14.5 Memory: 16384MB"
+
+
+def test_system_info_falls_back_to_kernel_release(monkeypatch):
+    monkeypatch.setattr(macos.platform, "mac_ver", lambda: ("", ("", "", ""), ""))
+    monkeypatch.setattr(macos.platform, "release", lambda: "23.5.0")
+
+    result = _text(asyncio.run(macos._get_system_info()))
+
+    assert " macOS: 23.5.0 Memory: " in result
+
+
+def test_dock_marshals_dispatcher_argv(dispatcher):
+    calls, results = dispatcher
+    results["resolution"] = "Resolution: 1000x800"
+    results["dock"] = "Safari"
+
+    result = _text(asyncio.run(macos.handle_tool_call(
+        "dock_window_horizontal", {"app_name": "Safari", "left_percent": 25, "right_percent": 75}
+    )))
+
+    assert calls == [("resolution",), ("dock", "Safari", "250", "500", "800")]
+    assert result == "Window docked horizontally: 25%-75% (250,500x800) Process: Safari"